@@ -1,24 +1,46 @@
 import pyautogui
 import time
 import os
+import sys
+import ctypes
+
+# Windows mouse_event 旗標
+MOUSEEVENTF_LEFTDOWN = 0x0002
+MOUSEEVENTF_LEFTUP = 0x0004
 
 class AutoClicker:
     def __init__(self):
         #滑鼠
         pyautogui.FAILSAFE = True
-        pyautogui.PAUSE = 0.1  # 操作後暫停
-        
+        pyautogui.PAUSE = 0  # 不在每次操作後暫停，點擊節奏由呼叫端控制
+        # Windows 直接呼叫 user32，略過 pyautogui 的移動動畫與額外延遲
+        self._user32 = ctypes.windll.user32 if sys.platform == "win32" else None
+
+    def move_to(self, x, y):
+        """
+        立即將滑鼠移到指定座標（無移動動畫）
+
+        :param x
+        :param y
+        """
+        # 直接呼叫系統 API 不會經過 pyautogui 的防呆檢查，因此先自行檢查
+        pyautogui.failSafeCheck()
+        if self._user32:
+            self._user32.SetCursorPos(int(x), int(y))
+        else:
+            pyautogui.moveTo(x, y)
+
     def click(self, x, y):
         """
         再截圖指定座標點擊
-        
+        失敗時（包含滑鼠移到角落觸發的 FailSafeException）直接拋出例外，由呼叫端處理
+
         :param x
         :param y
         """
-        try:
-
-            pyautogui.moveTo(x, y, duration=0.2)
+        self.move_to(x, y)
 
+        if self._user32:
+            self._user32.mouse_event(MOUSEEVENTF_LEFTDOWN | MOUSEEVENTF_LEFTUP, 0, 0, 0, 0)
+        else:
             pyautogui.click()
-        except Exception as e:
-            print(f"點擊失敗ㄌ: {str(e)}")
\ No newline at end of file
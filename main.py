@@ -2,56 +2,84 @@ import sys
 import time
 import io
 import os
-import json
 import base64
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QPushButton, 
     QVBoxLayout, QHBoxLayout, QWidget, QLabel, 
-    QMessageBox, QListWidget, QMenu, QDialog, QDialogButtonBox
+    QMessageBox, QListWidget, QMenu, QDialog, QDialogButtonBox,
+    QDoubleSpinBox
 )
 from PyQt5.QtCore import (
     Qt, QPoint, QRect, QSize, QThread, pyqtSignal, 
-    QEvent, pyqtSlot, QBuffer, QIODevice, QByteArray
+    QEvent, pyqtSlot, QBuffer, QIODevice, QByteArray, QTimer,
+    QMutex, QWaitCondition
 )
 from PyQt5.QtGui import (
     QScreen, QPixmap, QPainter, QColor, QPen
 )
 
 import ddddocr
+import mss
+import orjson
+import xxhash
 import numpy as np
 from PIL import Image
 import pyautogui
 from datetime import datetime
 
+from auto_clicker import AutoClicker
+
 JSON_FILE = "saved_captures.json"
+CAPTURE_DIR = "captures"  # 擷取圖片的存放資料夾
+OCR_WORKERS = min(4, os.cpu_count() or 1)  # OCR 執行緒池大小（每個執行緒各一個 ddddocr 實例）
+OCR_CACHE_SIZE = 256  # OCR 結果快取的最大筆數
+THUMB_SIZE = (32, 16)  # 像素比對用灰階縮圖的 (寬, 高)
+THUMB_DIFF_THRESHOLD = 1024  # 縮圖像素差總和低於此值即視為未變動（平均每像素 2）
+SAVE_DEBOUNCE_MS = 500  # 毫秒；連續修改時延後合併存檔
+CLICK_INTERVAL = 0.1  # 秒；同一區域連續點擊之間的預設間隔
+CYCLE_INTERVAL = 1.0  # 秒；持續執行模式每一輪的目標週期
 
 class CaptureInfo:
-    def __init__(self, x, y, width, height, image, ocr_text):
+    def __init__(self, x, y, width, height, image, ocr_text, image_path=None):
         self.x = x
         self.y = y
         self.width = width
         self.height = height
-        self.image = image  # QPixmap
+        self._image = image  # QPixmap；由檔案載入的擷取在第一次使用時才讀取
+        self.image_path = image_path  # 圖片檔路徑，第一次存檔時才建立
         self.ocr_text = ocr_text
         self.click_count = 1  # 可自行調整預設值
+        # 是否先以像素比對略過 OCR；畫面內容會變動的區域可設為 False
+        self.pixel_filter = True
+        # 參考畫面的灰階縮圖（uint8, THUMB_SIZE），供像素比對使用
+        self.thumb = None
 
     def __str__(self):
-        return f"文字: {self.ocr_text} (點擊次數: {self.click_count})"
+        pixel_filter = "開" if self.pixel_filter else "關"
+        return f"文字: {self.ocr_text} (點擊次數: {self.click_count}, 像素比對: {pixel_filter})"
+
+    @property
+    def image(self):
+        """ 擷取圖片（QPixmap），第一次存取時才從 image_path 載入。 """
+        if self._image is None:
+            self._image = QPixmap(self.image_path)
+        return self._image
 
     def to_dict(self):
         """
         將此擷取信息轉成可保存於 JSON 的字典格式。
-        使用 QBuffer 介面將 QPixmap 轉為 base64，避免
-        QPixmap.save() 直接對 BytesIO 造成 TypeError。
+        圖片只在第一次存檔時寫成 CAPTURE_DIR 底下的 PNG 檔，
+        JSON 中僅記錄檔案路徑，避免 base64 讓檔案膨脹。
         """
-        byte_array = QByteArray()
-        buffer = QBuffer(byte_array)
-        buffer.open(QIODevice.WriteOnly)
-        self.image.save(buffer, "PNG")
-        buffer.close()
-
-        encoded_image = base64.b64encode(byte_array.data()).decode("utf-8")
+        if not self.image_path:
+            os.makedirs(CAPTURE_DIR, exist_ok=True)
+            self.image_path = os.path.join(CAPTURE_DIR, f"{uuid.uuid4().hex}.png")
+            self.image.save(self.image_path, "PNG")
         
         return {
             "x": self.x,
@@ -60,18 +88,25 @@ class CaptureInfo:
             "height": self.height,
             "ocr_text": self.ocr_text,
             "click_count": self.click_count,
-            "encoded_image": encoded_image
+            "pixel_filter": self.pixel_filter,
+            "thumb": base64.b64encode(self.thumb.tobytes()).decode("utf-8") if self.thumb is not None else None,
+            "image_path": self.image_path
         }
 
     @staticmethod
     def from_dict(data):
         """
         從字典還原為 CaptureInfo 物件。
-        將 base64 字串轉回 QPixmap。
+        有 image_path 時不立即載入圖片，待預覽時才讀取；
+        舊版格式的 base64 圖片仍可讀取，並會在下次存檔時轉存為圖片檔。
         """
-        decoded_image = base64.b64decode(data["encoded_image"])
-        qpixmap = QPixmap()
-        qpixmap.loadFromData(decoded_image, "PNG")
+        image_path = data.get("image_path")
+        if image_path:
+            qpixmap = None
+        else:
+            decoded_image = base64.b64decode(data["encoded_image"])
+            qpixmap = QPixmap()
+            qpixmap.loadFromData(decoded_image, "PNG")
 
         cap = CaptureInfo(
             data["x"],
@@ -79,12 +114,40 @@ class CaptureInfo:
             data["width"],
             data["height"],
             qpixmap,
-            data["ocr_text"]
+            data["ocr_text"],
+            image_path
         )
         cap.click_count = data.get("click_count", 1)
+        cap.pixel_filter = data.get("pixel_filter", True)
+        if data.get("thumb"):
+            cap.thumb = np.frombuffer(
+                base64.b64decode(data["thumb"]), dtype=np.uint8
+            ).reshape(THUMB_SIZE[1], THUMB_SIZE[0])
         return cap
 
+    @staticmethod
+    def make_thumb(image):
+        """ 將 PIL 影像縮成 THUMB_SIZE 的灰階縮圖（區域平均），回傳 uint8 陣列。 """
+        return np.asarray(image.convert("L").resize(THUMB_SIZE, Image.BOX))
+
+    def matches_reference(self, thumb):
+        """
+        比對目前畫面的縮圖與參考縮圖，
+        像素差總和低於 THUMB_DIFF_THRESHOLD 時視為畫面未變動。
+        """
+        if self.thumb is None:
+            return False
+        return np.abs(thumb.astype(np.int16) - self.thumb).sum() < THUMB_DIFF_THRESHOLD
+
+    def delete_image_file(self):
+        """ 刪除此擷取對應的圖片檔（若存在）。 """
+        if self.image_path and os.path.exists(self.image_path):
+            os.remove(self.image_path)
+
 class ScreenCaptureWidget(QWidget):
+    capture_completed = pyqtSignal(dict)  # 框選完成，附帶擷取資訊
+    capture_cancelled = pyqtSignal()  # 未完成框選就關閉（Esc、Alt+F4 等）
+
     def __init__(self):
         super().__init__()
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
@@ -93,18 +156,25 @@ class ScreenCaptureWidget(QWidget):
         
         screen = QApplication.primaryScreen()
         self.original_screenshot = screen.grabWindow(0)
+
+        # 預先合成加上半透明遮罩的畫面，重繪時只需貼上一次
+        self._darkened = QPixmap(self.original_screenshot)
+        mask_painter = QPainter(self._darkened)
+        mask_painter.fillRect(self._darkened.rect(), QColor(0, 0, 0, 100))
+        mask_painter.end()
         
         self.begin = QPoint()
         self.end = QPoint()
         self.is_drawing = False
+        self.completed = False  # 是否已完成框選
+
+    def selection_rect(self):
+        """ 目前的選取範圍（已正規化）。 """
+        return QRect(self.begin, self.end).normalized()
 
     def paintEvent(self, event):
         painter = QPainter(self)
-        painter.drawPixmap(self.rect(), self.original_screenshot)
-        
-        # 半透明遮罩
-        mask = QColor(0, 0, 0, 100)
-        painter.fillRect(self.rect(), mask)
+        painter.drawPixmap(self.rect(), self._darkened)
         
         if self.is_drawing:
             pen = QPen(Qt.red, 2, Qt.SolidLine)
@@ -123,8 +193,10 @@ class ScreenCaptureWidget(QWidget):
 
     def mouseMoveEvent(self, event):
         if self.is_drawing:
+            old_rect = self.selection_rect()
             self.end = event.pos()
-            self.update()
+            # 只重繪選取框前後變動的範圍（外擴以涵蓋紅色邊框）
+            self.update(old_rect.united(self.selection_rect()).adjusted(-4, -4, 4, 4))
 
     def mouseReleaseEvent(self, event):
         if event.button() == Qt.LeftButton and self.is_drawing:
@@ -135,19 +207,28 @@ class ScreenCaptureWidget(QWidget):
                 
                 if x2 - x1 > 0 and y2 - y1 > 0:
                     screenshot = self.original_screenshot.copy(x1, y1, x2 - x1, y2 - y1)
-                    self.capture_info = {
+                    capture_info = {
                         'x': x1,
                         'y': y1,
                         'width': x2 - x1,
                         'height': y2 - y1,
                         'image': screenshot
                     }
+                    # 先關閉遮罩再通知，OCR 期間畫面不會停在擷取視窗上
+                    self.completed = True
                     self.close()
+                    self.capture_completed.emit(capture_info)
 
     def keyPressEvent(self, event):
         if event.key() == Qt.Key_Escape:
             self.close()
 
+    def closeEvent(self, event):
+        """ 任何方式關閉視窗時，若尚未完成框選則通知取消。 """
+        if not self.completed:
+            self.capture_cancelled.emit()
+        super().closeEvent(event)
+
 class WorkerThread(QThread):
     """使程式持續執行點擊的執行緒。"""
     update_status = pyqtSignal(str)
@@ -156,27 +237,84 @@ class WorkerThread(QThread):
         super().__init__()
         self.main_window = main_window
         self.keep_running = True  # 控制執行緒的運行
+        # 用於兩輪之間的等待，stop() 可立即喚醒
+        self._mutex = QMutex()
+        self._cond = QWaitCondition()
 
     def run(self):
-        # 不斷循環執行點擊，直到 keep_running 為 False
-        while self.keep_running:
-            self.main_window.execute_all_clicks(infinite_mode=True)
-            time.sleep(1)  # 適度延遲以避免過度頻繁執行
+        # mss 實例不可跨執行緒共用，因此在此執行緒內另建一個
+        with mss.mss() as sct:
+            # 不斷循環執行點擊，直到 keep_running 為 False
+            while self.keep_running:
+                started = time.monotonic()
+                self.main_window._run_clicks_impl(sct, infinite_mode=True, worker=self)
+                # 扣除本輪實際耗時後再等待，維持固定的執行週期
+                remaining = max(0.0, CYCLE_INTERVAL - (time.monotonic() - started))
+                self._mutex.lock()
+                if self.keep_running:
+                    self._cond.wait(self._mutex, int(remaining * 1000))
+                self._mutex.unlock()
 
     def stop(self):
+        self._mutex.lock()
         self.keep_running = False
+        self._cond.wakeAll()
+        self._mutex.unlock()
+
+class ExecuteThread(QThread):
+    """在背景執行一次點擊流程的執行緒，避免阻塞介面。"""
+
+    def __init__(self, task):
+        super().__init__()
+        self.task = task  # 接收 mss 實例的可呼叫物件
+
+    def run(self):
+        # mss 實例不可跨執行緒共用，因此在此執行緒內另建一個
+        with mss.mss() as sct:
+            self.task(sct)
 
 class MainWindow(QMainWindow):
+    status_updated = pyqtSignal(str)  # 由執行緒回報狀態文字
+    execution_failed = pyqtSignal(str, str)  # (狀態文字, 錯誤訊息)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle('多區域OCR自動點擊器')
         self.setGeometry(100, 100, 800, 600)
         
         self.captures = []
-        self.ocr = ddddocr.DdddOcr()
+        # 已刪除、等待 JSON 更新後才移除圖片檔的擷取
+        self._pending_image_deletes = []
+        # 以區域像素指紋為鍵的 OCR 結果快取（LRU）
+        self._ocr_cache = OrderedDict()
+        # 常駐的 OCR 執行緒池；ONNX Runtime session 不保證可跨執行緒共用，
+        # 因此每個工作執行緒啟動時透過 threading.local 各自建立並暖機 ddddocr 實例。
+        # 所有 OCR（包含新增擷取時的辨識）都經由此執行緒池執行。
+        # 先在主執行緒建立一次實例驗證模型，載入失敗時於啟動時直接報錯，
+        # 而不是之後才在執行緒池中變成難以追查的 BrokenThreadPool。
+        ddddocr.DdddOcr(show_ad=False)
+        self._ocr_local = threading.local()
+        self._pool = ThreadPoolExecutor(
+            max_workers=OCR_WORKERS, initializer=self._init_ocr_worker
+        )
+        self.warm_up_ocr()
+
+        # 連續修改時，只在最後一次修改後延遲存檔一次（見 schedule_save）
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(SAVE_DEBOUNCE_MS)
+        self._save_timer.timeout.connect(self.save_captures_to_json)
+
+        self.clicker = AutoClicker()
+        # 同一區域連續點擊之間的等待秒數，可由介面調整
+        self.click_interval = CLICK_INTERVAL
 
         # 用於控制是否處於“持續執行”狀態
         self.worker_thread = None
+        # 執行單輪點擊（所有點擊或單點測試）的背景執行緒
+        self.execute_thread = None
+        # 目前開啟中的擷取視窗
+        self.screen_capture = None
         
         self.init_ui()
         # 啟動時嘗試從 JSON 載入先前的擷取資訊
@@ -286,18 +424,38 @@ class MainWindow(QMainWindow):
             }
         """)
         
+        # 連點間隔：同一區域點擊多次時，每次點擊之間的等待秒數
+        interval_row = QWidget()
+        interval_layout = QHBoxLayout(interval_row)
+        interval_layout.setContentsMargins(0, 0, 0, 0)
+        interval_layout.addWidget(QLabel('連點間隔（秒）'))
+        self.click_interval_spin = QDoubleSpinBox()
+        self.click_interval_spin.setRange(0.0, 2.0)
+        self.click_interval_spin.setSingleStep(0.05)
+        self.click_interval_spin.setDecimals(2)
+        self.click_interval_spin.setValue(self.click_interval)
+        self.click_interval_spin.valueChanged.connect(self.set_click_interval)
+        interval_layout.addWidget(self.click_interval_spin)
+
         self.status_label = QLabel('準備就緒')
+        self.status_updated.connect(self.status_label.setText)
+        self.execution_failed.connect(self.show_execution_error)
         
         right_layout.addWidget(self.preview_label)
         right_layout.addWidget(self.ocr_result)
         right_layout.addWidget(self.execute_button)
         right_layout.addWidget(self.execute_single_button)
+        right_layout.addWidget(interval_row)
         right_layout.addWidget(self.status_label)
         
         # 設置左右面板比例
         main_layout.addWidget(left_panel, 1)
         main_layout.addWidget(right_panel, 2)
 
+    def set_click_interval(self, value):
+        """ 由介面更新連點間隔（秒）；執行緒只讀取此屬性，不直接存取元件。 """
+        self.click_interval = value
+
     def show_context_menu(self, position):
         if not self.capture_list.itemAt(position):
             return
@@ -305,6 +463,7 @@ class MainWindow(QMainWindow):
         menu = QMenu()
         delete_action = menu.addAction("刪除")
         set_clicks_action = menu.addAction("設置點擊次數")
+        pixel_filter_action = menu.addAction("切換像素比對（略過 OCR）")
         
         action = menu.exec_(self.capture_list.mapToGlobal(position))
         
@@ -312,14 +471,16 @@ class MainWindow(QMainWindow):
             self.delete_capture()
         elif action == set_clicks_action:
             self.set_click_count()
+        elif action == pixel_filter_action:
+            self.toggle_pixel_filter()
 
     def delete_capture(self):
         current_row = self.capture_list.currentRow()
         if current_row >= 0:
             self.capture_list.takeItem(current_row)
-            self.captures.pop(current_row)
-            # 每次修改後保存一次
-            self.save_captures_to_json()
+            # 圖片檔待 JSON 不再引用後（存檔完成時）才刪除
+            self._pending_image_deletes.append(self.captures.pop(current_row))
+            self.schedule_save()
 
     def set_click_count(self):
         current_row = self.capture_list.currentRow()
@@ -329,51 +490,60 @@ class MainWindow(QMainWindow):
             current_index = counts.index(capture.click_count) if capture.click_count in counts else 0
             capture.click_count = counts[(current_index + 1) % len(counts)]
             self.capture_list.currentItem().setText(str(capture))
-            # 每次修改後保存一次
-            self.save_captures_to_json()
+            self.schedule_save()
+
+    def toggle_pixel_filter(self):
+        """
+        切換選取區域的像素比對：開啟時畫面與參考縮圖相同即直接點擊，
+        關閉時每次都以 OCR 確認，適合內容會變動的區域。
+        """
+        current_row = self.capture_list.currentRow()
+        if current_row >= 0:
+            capture = self.captures[current_row]
+            capture.pixel_filter = not capture.pixel_filter
+            self.capture_list.currentItem().setText(str(capture))
+            self.schedule_save()
 
     def start_capture(self):
-        """ 進行螢幕擷取，並自動 OCR。 """
+        """ 進行螢幕擷取，擷取完成後由 _on_capture_done 接手 OCR。 """
         self.hide()
         QApplication.processEvents()
         
-        screen_capture = ScreenCaptureWidget()
-        screen_capture.show()
-        
-        # 等待擷取視窗關閉
-        while screen_capture.isVisible():
-            QApplication.processEvents()
+        # 保留參考，避免擷取視窗在等待使用者框選時被回收
+        self.screen_capture = ScreenCaptureWidget()
+        self.screen_capture.capture_completed.connect(self._on_capture_done)
+        self.screen_capture.capture_cancelled.connect(self.show)
+        self.screen_capture.show()
+
+    def _on_capture_done(self, info):
+        """ 擷取完成後進行 OCR，並加入擷取列表。 """
+        pixmap = info['image']
         
-        # 擷取完成後進行 OCR
-        if hasattr(screen_capture, 'capture_info'):
-            info = screen_capture.capture_info
-            pixmap = info['image']
-            temp_path = f"temp_capture_{len(self.captures)}.png"
-            pixmap.save(temp_path)
+        try:
+            # 直接在記憶體中轉成 PNG bytes，不經過暫存檔
+            byte_array = QByteArray()
+            buffer = QBuffer(byte_array)
+            buffer.open(QIODevice.WriteOnly)
+            pixmap.save(buffer, "PNG")
+            buffer.close()
             
-            try:
-                with open(temp_path, 'rb') as f:
-                    image_bytes = f.read()
-                
-                ocr_text = self.ocr.classification(image_bytes)
-                
-                capture = CaptureInfo(
-                    info['x'], info['y'],
-                    info['width'], info['height'],
-                    pixmap, ocr_text
-                )
-                
-                self.captures.append(capture)
-                self.capture_list.addItem(str(capture))
-                # 新增後存檔
-                self.save_captures_to_json()
-                
-            except Exception as e:
-                QMessageBox.warning(self, "錯誤", f"OCR識別失敗: {str(e)}")
+            image_bytes = bytes(byte_array)
+            ocr_text = self._pool.submit(self._classify_in_worker, image_bytes).result()
+            
+            capture = CaptureInfo(
+                info['x'], info['y'],
+                info['width'], info['height'],
+                pixmap, ocr_text
+            )
+            capture.thumb = CaptureInfo.make_thumb(Image.open(io.BytesIO(image_bytes)))
             
-            # 刪除暫存檔
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
+            self.captures.append(capture)
+            self.capture_list.addItem(str(capture))
+            # 新增後存檔
+            self.schedule_save()
+            
+        except Exception as e:
+            QMessageBox.warning(self, "錯誤", f"OCR識別失敗: {str(e)}")
         
         self.show()
 
@@ -387,61 +557,211 @@ class MainWindow(QMainWindow):
             self.preview_label.setPixmap(scaled_pixmap)
             self.ocr_result.setText(f"OCR結果: {capture.ocr_text}")
 
-    def execute_all_clicks(self, infinite_mode=False):
+    def grab_region_crops(self, captures, sct):
+        """
+        以單次全螢幕擷取取得所有區域的畫面。
+        回傳與 captures 順序相同的 BGRA NumPy 陣列（原始畫面的切片，不複製）；
+        區域全部或部分超出畫面（例如解析度改變後）時，該區域回傳 None。
+        sct 為呼叫端執行緒自己的 mss 實例。
+        """
+        monitor = sct.monitors[1]
+        raw = np.asarray(sct.grab(monitor))
+        left, top = monitor["left"], monitor["top"]
+        frame_height, frame_width = raw.shape[:2]
+        crops = []
+        for c in captures:
+            x, y = c.x - left, c.y - top
+            if x < 0 or y < 0 or x + c.width > frame_width or y + c.height > frame_height:
+                crops.append(None)
+            else:
+                crops.append(raw[y:y + c.height, x:x + c.width])
+        return crops
+
+    def ocr_crops(self, crops):
+        """
+        對多個區域畫面進行 OCR，回傳與 crops 順序相同的文字列表。
+        以像素內容的雜湊值查詢快取，畫面未變動的區域直接沿用先前結果；
+        只有未命中的區域才會轉成 PIL 影像並批次送進 ddddocr（不經過 PNG 編碼）。
+        """
+        texts = [None] * len(crops)
+        missed = []  # (索引, 雜湊值, PIL 影像)
+        for i, crop in enumerate(crops):
+            fingerprint = xxhash.xxh3_64(repr(crop.shape).encode())
+            fingerprint.update(np.ascontiguousarray(crop))
+            digest = fingerprint.digest()
+            if digest in self._ocr_cache:
+                self._ocr_cache.move_to_end(digest)
+                texts[i] = self._ocr_cache[digest]
+                continue
+            # BGRA -> RGB，ddddocr 可直接接受 PIL 影像
+            missed.append((i, digest, Image.fromarray(crop[:, :, 2::-1])))
+
+        if missed:
+            results = self._pool.map(self._classify_in_worker, [image for _, _, image in missed])
+            for (i, digest, _), text in zip(missed, results):
+                texts[i] = text
+                self._ocr_cache[digest] = text
+                if len(self._ocr_cache) > OCR_CACHE_SIZE:
+                    self._ocr_cache.popitem(last=False)
+        return texts
+
+    def warm_up_ocr(self):
+        """
+        在背景預先啟動 OCR 工作執行緒，介面不需等待暖機完成即可顯示。
+        每個工作執行緒在啟動時由 _init_ocr_worker 建立並暖機自己的 ddddocr 實例；
+        這裡送出的空工作只是讓執行緒池提早建立執行緒，
+        之後才建立的執行緒同樣會在處理第一個工作前完成暖機。
+        """
+        for _ in range(OCR_WORKERS):
+            self._pool.submit(lambda: None)
+
+    def _init_ocr_worker(self):
         """
-        執行所有擷取區域的點擊。 
+        OCR 工作執行緒的初始化函式：建立該執行緒專屬的 ddddocr 實例，
+        並以空白影像辨識一次，讓 ONNX Runtime 先完成初始化。
+        """
+        try:
+            ocr = self._ocr_local.ocr = ddddocr.DdddOcr(show_ad=False)
+            ocr.classification(Image.new('RGB', (50, 20), 'white'))
+        except Exception as e:
+            # 初始化失敗會使執行緒池失效，之後只剩 BrokenThreadPool，因此先印出原因
+            print(f"OCR 工作執行緒初始化失敗: {str(e)}")
+            raise
+
+    def _classify_in_worker(self, image):
+        """ 在 OCR 執行緒池內執行，使用該工作執行緒專屬的 ddddocr 實例。 """
+        return self._ocr_local.ocr.classification(image)
+
+    def match_captures(self, captures, crops):
+        """
+        判斷每個區域目前的畫面是否仍符合擷取時的內容，
+        回傳與 captures 順序相同的 [(是否符合, 目前文字), ...]。
+        縮圖與參考縮圖幾乎相同的區域直接視為符合，不再進行 OCR；
+        其餘區域批次送進 ocr_crops，符合時更新其參考縮圖。
+        """
+        results = [None] * len(captures)
+        thumbs = [None] * len(captures)
+        pending = []
+        for i, (capture, crop) in enumerate(zip(captures, crops)):
+            # 超出畫面的區域只視為該區域不符合，不影響其他區域
+            if crop is None:
+                results[i] = (False, "區域超出螢幕範圍")
+                continue
+            if capture.pixel_filter:
+                thumbs[i] = CaptureInfo.make_thumb(Image.fromarray(crop[:, :, 2::-1]))
+                if capture.matches_reference(thumbs[i]):
+                    results[i] = (True, capture.ocr_text)
+                    continue
+            pending.append(i)
+
+        texts = self.ocr_crops([crops[i] for i in pending])
+        for i, text in zip(pending, texts):
+            capture = captures[i]
+            matched = text.strip() == capture.ocr_text.strip()
+            if matched and thumbs[i] is not None:
+                capture.thumb = thumbs[i]
+            results[i] = (matched, text)
+        return results
+
+    def is_executing(self):
+        """ 是否有點擊流程（單輪執行或持續執行）正在進行。 """
+        return bool(
+            (self.execute_thread and self.execute_thread.isRunning())
+            or (self.worker_thread and self.worker_thread.isRunning())
+        )
+
+    def set_execute_buttons_enabled(self, enabled):
+        """ 執行期間停用所有會啟動點擊流程的按鈕，避免兩個流程同時操作滑鼠。 """
+        self.execute_button.setEnabled(enabled)
+        self.execute_single_button.setEnabled(enabled)
+        self.start_infinite_button.setEnabled(enabled)
+
+    def start_execute_thread(self, task):
+        """ 以 ExecuteThread 在背景執行 task；已有執行中的流程時不重複啟動。 """
+        if self.is_executing():
+            self.status_label.setText("已有點擊流程在執行中。")
+            return
+        self.execute_thread = ExecuteThread(task)
+        self.execute_thread.finished.connect(self._on_execute_finished)
+        self.set_execute_buttons_enabled(False)
+        self.execute_thread.start()
+
+    def _on_execute_finished(self):
+        """ 單輪執行結束後恢復按鈕。 """
+        self.set_execute_buttons_enabled(True)
+
+    def show_execution_error(self, status_text, message):
+        """ 顯示背景執行緒回報的錯誤。 """
+        self.status_label.setText(status_text)
+        QMessageBox.warning(self, "錯誤", message)
+
+    def execute_all_clicks(self):
+        """ 在背景執行緒中執行所有擷取區域的點擊。 """
+        self.start_execute_thread(self._run_clicks_impl)
+
+    def _run_clicks_impl(self, sct, infinite_mode=False, worker=None):
+        """
+        執行所有擷取區域的點擊（於 ExecuteThread 或 WorkerThread 中執行）。
         如果 infinite_mode=True，表示在持續執行的模式下呼叫此函式。
+        sct 為呼叫端執行緒自己的 mss 實例。
+        worker 為持續執行的 WorkerThread，每個區域之間會檢查是否已要求停止。
         """
         try:
             if not infinite_mode:
-                self.status_label.setText("開始執行點擊...")
-            QApplication.processEvents()
+                self.status_updated.emit("開始執行點擊...")
             
             # 保存原始滑鼠位置
             original_x, original_y = pyautogui.position()
-            
-            for capture in self.captures:
-                # 先重新擷取該區域並進行OCR，只有當OCR結果符合最初擷取到的內容時才點擊
-                new_screenshot = pyautogui.screenshot(
-                    region=(capture.x, capture.y, capture.width, capture.height)
-                )
-                img_bytes = io.BytesIO()
-                new_screenshot.save(img_bytes, format="PNG")
-                img_bytes.seek(0)
-                current_ocr_text = self.ocr.classification(img_bytes.getvalue())
 
-                if current_ocr_text.strip() == capture.ocr_text.strip():
+            # 先擷取所有區域，再一次批次送進 OCR，
+            # 只有當OCR結果符合最初擷取到的內容時才點擊
+            captures = list(self.captures)
+            crops = self.grab_region_crops(captures, sct)
+            results = self.match_captures(captures, crops)
+
+            # 迴圈內會重複使用的屬性先綁定為區域變數
+            click = self.clicker.click
+            click_interval = self.click_interval
+
+            for capture, (matched, current_ocr_text) in zip(captures, results):
+                # 持續執行時，stop() 可在本輪中途結束
+                if worker and not worker.keep_running:
+                    break
+                if matched:
                     click_x = capture.x + capture.width // 2
                     click_y = capture.y + capture.height // 2
+                    click_count = capture.click_count
+                    # 每個區域只回報一次狀態，不在每次點擊時更新
+                    if not infinite_mode:
+                        self.status_updated.emit(f"點擊 '{capture.ocr_text}' x {click_count}")
                     
-                    for i in range(capture.click_count):
-                        if not infinite_mode:
-                            self.status_label.setText(
-                                f"點擊 '{capture.ocr_text}' ({i+1}/{capture.click_count})"
-                            )
-                        QApplication.processEvents()
-                        
-                        pyautogui.moveTo(click_x, click_y, duration=0.2)
-                        pyautogui.click()
-                        time.sleep(0.2)
+                    for n in range(click_count):
+                        # 只在同一區域的連續點擊之間等待，避免被合併成雙擊或遺漏
+                        if n and click_interval:
+                            time.sleep(click_interval)
+                        click(click_x, click_y)
                 else:
+                    # 持續執行時不顯示也不停頓，避免拖慢停止與執行週期
                     if not infinite_mode:
-                        self.status_label.setText(
+                        self.status_updated.emit(
                             f"跳過: OCR未符合 '{capture.ocr_text}', 目前為 '{current_ocr_text}'"
                         )
-                    QApplication.processEvents()
-                    time.sleep(0.5)
+                        time.sleep(0.5)
             
             # 恢復滑鼠位置
-            pyautogui.moveTo(original_x, original_y, duration=0.2)
+            self.clicker.move_to(original_x, original_y)
 
             if not infinite_mode:
-                self.status_label.setText("所有點擊已完成")
+                self.status_updated.emit("所有點擊已完成")
             
+        except pyautogui.FailSafeException:
+            # 滑鼠移到螢幕角落：持續執行時一併停止，不進入下一輪
+            if worker:
+                worker.stop()
+            self.status_updated.emit("已觸發防呆（滑鼠移到螢幕角落），停止點擊。")
         except Exception as e:
             if not infinite_mode:
-                self.status_label.setText(f"執行錯誤: {str(e)}")
-                QMessageBox.warning(self, "錯誤", str(e))
+                self.execution_failed.emit(f"執行錯誤: {str(e)}", str(e))
 
     def execute_single_click(self):
         """
@@ -454,45 +774,39 @@ class MainWindow(QMainWindow):
             return
 
         capture = self.captures[current_row]
+        self.start_execute_thread(lambda sct: self._run_single_click_impl(capture, sct))
+
+    def _run_single_click_impl(self, capture, sct):
+        """ 對單一擷取區域執行一次點擊（於 ExecuteThread 中執行）。 """
         try:
-            self.status_label.setText("開始執行單點...")
-            QApplication.processEvents()
+            self.status_updated.emit("開始執行單點...")
             
             # 保存原始滑鼠位置
             original_x, original_y = pyautogui.position()
 
-            new_screenshot = pyautogui.screenshot(
-                region=(capture.x, capture.y, capture.width, capture.height)
-            )
-            img_bytes = io.BytesIO()
-            new_screenshot.save(img_bytes, format="PNG")
-            img_bytes.seek(0)
-            current_ocr_text = self.ocr.classification(img_bytes.getvalue())
+            crop = self.grab_region_crops([capture], sct)[0]
+            matched, current_ocr_text = self.match_captures([capture], [crop])[0]
 
-            if current_ocr_text.strip() == capture.ocr_text.strip():
+            if matched:
                 click_x = capture.x + capture.width // 2
                 click_y = capture.y + capture.height // 2
 
-                self.status_label.setText(f"單點執行: 點擊 '{capture.ocr_text}'")
-                QApplication.processEvents()
+                self.status_updated.emit(f"單點執行: 點擊 '{capture.ocr_text}'")
                 
-                pyautogui.moveTo(click_x, click_y, duration=0.2)
-                pyautogui.click()
-                time.sleep(0.2)
+                self.clicker.click(click_x, click_y)
             else:
-                self.status_label.setText(
+                self.status_updated.emit(
                     f"跳過: OCR未符合 '{capture.ocr_text}', 目前為 '{current_ocr_text}'"
                 )
-                QApplication.processEvents()
-                time.sleep(0.5)
             
             # 恢復滑鼠位置
-            pyautogui.moveTo(original_x, original_y, duration=0.2)
-            self.status_label.setText("單點執行已完成")
+            self.clicker.move_to(original_x, original_y)
+            self.status_updated.emit("單點執行已完成")
             
+        except pyautogui.FailSafeException:
+            self.status_updated.emit("已觸發防呆（滑鼠移到螢幕角落），停止點擊。")
         except Exception as e:
-            self.status_label.setText(f"單點執行錯誤: {str(e)}")
-            QMessageBox.warning(self, "錯誤", str(e))
+            self.execution_failed.emit(f"單點執行錯誤: {str(e)}", str(e))
 
     def start_infinite_execution(self):
         """
@@ -503,6 +817,10 @@ class MainWindow(QMainWindow):
         if self.worker_thread and self.worker_thread.isRunning():
             QMessageBox.information(self, "提示", "持續執行已經在進行中。")
             return
+        # 單輪執行尚未結束時也不可啟動，避免兩個流程同時操作滑鼠
+        if self.is_executing():
+            self.status_label.setText("已有點擊流程在執行中。")
+            return
 
         # 彈出對話框，提示即將開始
         dialog = QDialog(self)
@@ -521,6 +839,8 @@ class MainWindow(QMainWindow):
 
         # 按下確定後，啟動執行緒
         self.worker_thread = WorkerThread(self)
+        self.worker_thread.finished.connect(self._on_worker_finished)
+        self.set_execute_buttons_enabled(False)
         self.worker_thread.start()
 
         # 在主視窗安裝事件過濾器，用於偵測鍵盤 Enter
@@ -545,29 +865,56 @@ class MainWindow(QMainWindow):
             self.worker_thread.quit()
             self.worker_thread.wait()
             self.worker_thread = None
+        self.set_execute_buttons_enabled(True)
 
         # 移除事件過濾器
         self.removeEventFilter(self)
         self.status_label.setText("已停止持續執行。")
 
+    def _on_worker_finished(self):
+        """
+        持續執行的執行緒結束時（包含自行結束或發生錯誤）恢復按鈕，
+        並移除 Enter 鍵的事件過濾器。
+        """
+        self.set_execute_buttons_enabled(True)
+        self.removeEventFilter(self)
+
+    def schedule_save(self):
+        """
+        標記資料已修改，於 SAVE_DEBOUNCE_MS 後存檔；
+        期間內的多次修改只會合併成一次寫入。關閉視窗時會立即存檔。
+        """
+        self._save_timer.start()
+
     def save_captures_to_json(self):
         """
         將目前的擷取列表存到 JSON。
-        會使用 to_dict()，其中包含將 QPixmap 轉成 base64。
+        會使用 to_dict()，圖片另存成檔案，JSON 只記錄路徑。
+        先寫入暫存檔再以 os.replace 取代，避免中途失敗留下不完整的檔案。
+        JSON 更新完成後才刪除已移除擷取的圖片檔。
         """
         data = [capture.to_dict() for capture in self.captures]
-        with open(JSON_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        temp_path = JSON_FILE + ".tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        os.replace(temp_path, JSON_FILE)
+        self.remove_pending_image_files()
+
+    def remove_pending_image_files(self):
+        """ 刪除已移除擷取的圖片檔；只在 JSON 已不再引用它們之後呼叫。 """
+        for capture in self._pending_image_deletes:
+            capture.delete_image_file()
+        self._pending_image_deletes.clear()
 
     def load_captures_from_json(self):
         """
         從 JSON 載入擷取列表。
-        其中會使用 from_dict()，將 base64 還原成 QPixmap。
+        其中會使用 from_dict()，由圖片檔還原成 QPixmap。
         """
         if os.path.exists(JSON_FILE):
             try:
-                with open(JSON_FILE, 'r', encoding='utf-8') as f:
-                    data_list = json.load(f)
+                with open(JSON_FILE, 'rb') as f:
+                    data_list = orjson.loads(f.read())
                 self.captures.clear()
                 self.capture_list.clear()
 
@@ -586,7 +933,7 @@ class MainWindow(QMainWindow):
         1) 停止持續執行（若在執行）
         2) 清空 captures 與清單
         3) 清空右側預覽與 OCR 顯示
-        4) 刪除或重建 JSON 檔
+        4) 刪除或重建 JSON 檔，之後再刪除圖片檔
         """
         reply = QMessageBox.question(
             self,
@@ -601,7 +948,8 @@ class MainWindow(QMainWindow):
         # 1) 停止持續執行
         self.stop_infinite_execution()
 
-        # 2) 清空資料
+        # 2) 清空資料（圖片檔待 JSON 重建後才刪除）
+        self._pending_image_deletes.extend(self.captures)
         self.captures.clear()
         self.capture_list.clear()
 
@@ -617,21 +965,27 @@ class MainWindow(QMainWindow):
                 os.remove(JSON_FILE)
         except Exception as e:
             # 若刪除失敗，至少寫入為空陣列
-            with open(JSON_FILE, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
+            with open(JSON_FILE, 'wb') as f:
+                f.write(orjson.dumps([]))
+            self.remove_pending_image_files()
             QMessageBox.warning(self, "檔案處理", f"刪除 {JSON_FILE} 失敗，已改為重置為空內容：{e}")
             return
 
         # 重新寫入空陣列（可有可無，保證檔案存在且為空）
-        with open(JSON_FILE, 'w', encoding='utf-8') as f:
-            json.dump([], f, ensure_ascii=False, indent=2)
+        with open(JSON_FILE, 'wb') as f:
+            f.write(orjson.dumps([]))
+        self.remove_pending_image_files()
 
         QMessageBox.information(self, "完成", "已刪除全部內容並重置。")
 
     def closeEvent(self, event):
-        """ 在關閉視窗時確保執行緒停止，並保存資料 """
+        """ 在關閉視窗時確保執行緒停止，並保存資料、關閉 OCR 執行緒池 """
         self.stop_infinite_execution()
+        if self.execute_thread:
+            self.execute_thread.wait()
+        self._save_timer.stop()
         self.save_captures_to_json()
+        self._pool.shutdown(wait=False)
         super().closeEvent(event)
 
 if __name__ == '__main__':